@@ -1,6 +1,11 @@
 import pandas as pd
+import numpy as np
 import json
 import sys
+import os
+import math
+import pickle
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 if len (sys.argv) != 5:
     print('invalid arguments. Usage:')
@@ -23,6 +28,19 @@ min_vehicle = data["min_vehicle"]
 max_vehicle = data["max_vehicle"]
 vehicle_step_size = data["vehicle_step_size"]
 
+#fixed categories keep Decision and Result categorical after concatenation
+DECISION_TYPE = pd.CategoricalDtype(["EDGE", "CLOUD_VIA_RSU", "CLOUD_VIA_GSM"])
+RESULT_TYPE = pd.CategoricalDtype(["fail", "success"])
+
+#column types written by the simulator, other columns are inferred
+COLUMN_TYPES = dict.fromkeys(["ServiceTime", "ProcessingTime",
+                              "WANUploadDelay", "WANDownloadDelay",
+                              "GSMUploadDelay", "GSMDownloadDelay",
+                              "WLANUploadDelay", "WLANDownloadDelay",
+                              "AvgEdgeUtilization"], "float64")
+COLUMN_TYPES["Decision"] = DECISION_TYPE
+COLUMN_TYPES["Result"] = RESULT_TYPE
+
 def getDecisionColumnName(target):
     if target == "edge":
         COLUMN_NAME  = "EDGE"
@@ -50,31 +68,87 @@ def getRegressionColumns(target):
         result = ["TaskLength", "GSMUploadDelay", "GSMDownloadDelay", "ServiceTime"]
     return result
 
-def znorm(column):
-    column = (column - column.mean()) / column.std()
-    return column
-
-data_set =  []
-
-testDataStartIndex = (train_data_ratio * num_iterations) / 100
-
-for ite in range(num_iterations):
-    for vehicle in range(min_vehicle, max_vehicle+1, vehicle_step_size):
-        if (datatype == "train" and ite < testDataStartIndex) or (datatype == "test" and ite >= testDataStartIndex):
-            file_name = sim_result_folder + "/ite" + str(ite + 1) + "/" + str(vehicle) + "_learnerOutputFile.cvs"
-            df = [pd.read_csv(file_name, na_values = "?", comment='\t', sep=",")]
-            df[0]['VehicleCount'] = vehicle
-            #print(file_name)
-            data_set += df
-
-data_set = pd.concat(data_set, ignore_index=True)
-data_set = data_set[data_set['Decision'] == getDecisionColumnName(target)]
+def readLearnerOutputFile(file_name, columns, decision):
+    df = pd.read_csv(file_name, na_values = "?", comment='\t', sep=",", memory_map=True,
+                     usecols=columns, dtype={c: COLUMN_TYPES[c] for c in columns if c in COLUMN_TYPES})
+    return df[df['Decision'].cat.codes.to_numpy() == DECISION_TYPE.categories.get_loc(decision)]
+
+def isCacheValid(cache_file, source_files):
+    if not os.path.isfile(cache_file):
+        return False
+    cache_time = os.path.getmtime(cache_file)
+    return all(os.path.getmtime(file_name) <= cache_time for file_name in source_files)
+
+def sampleByVehicleCount(df, size, rng):
+    indices = []
+    for positions in df.groupby('VehicleCount').indices.values():
+        if len(positions) >= size:
+            positions = rng.choice(positions, size=size, replace=False)
+        indices.append(positions)
+    return df.iloc[np.concatenate(indices)] if indices else df
+
+#normalizes columns of X in place to avoid temporary arrays, missing values are skipped
+def znorm(X):
+    X -= np.nanmean(X, axis=0)
+    X /= np.nanstd(X, axis=0, ddof=1)
+    return X
 
 if method == "classifier":
     targetColumns = getClassifierColumns(target)
 else:
     targetColumns= getRegressionColumns(target)
 
+#only parse the columns used for this target, rows of other decisions are dropped per file
+#classifier and regression columns are both kept so that the cache below serves both methods
+readColumns = list(dict.fromkeys(["Decision", "Result"] + getClassifierColumns(target) + getRegressionColumns(target)))
+decisionColumnName = getDecisionColumnName(target)
+
+rng = np.random.default_rng()
+
+#ceiling keeps the split of the former float comparison (ite < ratio * num_iterations / 100)
+testDataStartIndex = int(math.ceil(train_data_ratio * num_iterations / 100))
+if datatype == "train":
+    iterations = range(testDataStartIndex)
+else:
+    iterations = range(testDataStartIndex, num_iterations)
+
+jobs = []
+for ite in iterations:
+    for vehicle in range(min_vehicle, max_vehicle+1, vehicle_step_size):
+        file_name = sim_result_folder + "/ite" + str(ite + 1) + "/" + str(vehicle) + "_learnerOutputFile.cvs"
+        jobs.append((ite, vehicle, file_name))
+
+#parsed data set is cached next to the .arff files together with the job list it was built from
+#it is rebuilt when the jobs (split, iterations or vehicle range) differ, or this script, config or any log is newer
+cache_file = sim_result_folder + "/" + target + "_" + datatype + "_cache.pkl"
+data_set = None
+if isCacheValid(cache_file, [__file__, sys.argv[1]] + [file_name for ite, vehicle, file_name in jobs]):
+    #a truncated cache or one written by another pandas version is parsed again
+    try:
+        cached_jobs, cached_data_set = pd.read_pickle(cache_file)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        cached_jobs, cached_data_set = None, None
+    if cached_jobs == jobs:
+        data_set = cached_data_set
+
+if data_set is None:
+    #reading csv files is I/O bound, pandas releases the GIL while parsing
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        futures = {executor.submit(readLearnerOutputFile, file_name, readColumns, decisionColumnName): index for index, (ite, vehicle, file_name) in enumerate(jobs)}
+        frames = [None] * len(jobs)
+        for future in as_completed(futures):
+            index = futures[future]
+            df = future.result()
+            df['VehicleCount'] = jobs[index][1]
+            frames[index] = df
+
+    data_set = pd.concat(frames, ignore_index=True)
+    for column in data_set.select_dtypes('int64').columns:
+        data_set[column] = data_set[column].astype('int32')
+    #written to a temporary file first so that an interrupted run cannot leave a partial cache
+    pd.to_pickle((jobs, data_set), cache_file + ".tmp")
+    os.replace(cache_file + ".tmp", cache_file)
+
 if datatype == "train":
     print ("##############################################################")
     print ("Stats for " + target + " - " + method)
@@ -84,38 +158,44 @@ if datatype == "train":
     print(train_stats)
     print ("##############################################################")
 
+#single precision is enough for balancing and normalization, the printed
+#statistics above are computed before the downcast to keep full precision
+for column in data_set[targetColumns].select_dtypes('float64').columns:
+    data_set[column] = data_set[column].astype('float32')
+
 #print("balancing " + target + " for " + method)
 
 #BALANCE DATA SET
 if method == "classifier":
-    df0 = data_set[data_set['Result']=="fail"]
-    df1 = data_set[data_set['Result']=="success"]
+    failMask = data_set['Result'].cat.codes.to_numpy() == RESULT_TYPE.categories.get_loc("fail")
+    df0 = data_set[failMask]
+    df1 = data_set[~failMask]
     
     #size = min(len(df0[df0['VehicleCount']==max_vehicle]), len(df1[df1['VehicleCount']==min_vehicle]))
     
-    size = len(df0[df0['VehicleCount']==max_vehicle]) // 2
+    size = int((df0['VehicleCount'].to_numpy() == max_vehicle).sum()) // 2
     
-    df1 = df1.groupby('VehicleCount').apply(lambda x: x if len(x) < size else x.sample(size))
-    df0 = df0.groupby('VehicleCount').apply(lambda x: x if len(x) < size else x.sample(size))
+    df1 = sampleByVehicleCount(df1, size, rng)
+    df0 = sampleByVehicleCount(df0, size, rng)
 
     data_set = pd.concat([df0, df1], ignore_index=True)
 else:        
-    data_set = data_set[data_set['Result'] == 'success']
+    data_set = data_set[data_set['Result'].cat.codes.to_numpy() == RESULT_TYPE.categories.get_loc('success')]
     
     #size = min(len(data_set[data_set['VehicleCount']==min_vehicle]), len(data_set[data_set['VehicleCount']==max_vehicle]))
     
-    size = len(data_set[data_set['VehicleCount']==max_vehicle]) // 3
-    data_set = data_set.groupby('VehicleCount').apply(lambda x: x if len(x.index) < size else x.sample(size))
+    size = int((data_set['VehicleCount'].to_numpy() == max_vehicle).sum()) // 3
+    data_set = sampleByVehicleCount(data_set, size, rng)
 
 #EXTRACT RELATED ATTRIBUTES
-df = pd.DataFrame(columns=targetColumns)
+normColumns = [c for c in targetColumns if c != 'Result' and c != 'ServiceTime']
+df = pd.DataFrame(znorm(data_set[normColumns].to_numpy(dtype=np.float32, copy=True)), columns=normColumns)
 for column in targetColumns:
-    if column == 'Result' or column == 'ServiceTime':
-        df[column] = data_set[column]
-    else:
-        df[column] = znorm(data_set[column])
+    if column not in normColumns:
+        df[column] = data_set[column].to_numpy()
+df = df[targetColumns]
 
-f = open(sim_result_folder + "/" + target + "_" + method + "_" + datatype + ".arff", 'w')
+f = open(sim_result_folder + "/" + target + "_" + method + "_" + datatype + ".arff", 'w', buffering=1<<20)
 f.write('@relation ' + target + '\n\n')
 for column in targetColumns:
     if column == 'Result':
@@ -123,7 +203,7 @@ for column in targetColumns:
     else:
         f.write('@attribute ' + column + ' REAL\n')
 f.write('\n@data\n')
-df.to_csv(f, header=False, index=False)
+df.to_csv(f, header=False, index=False, chunksize=65536, float_format='%.6g', lineterminator='\n')
 f.close()
 
 print ("##############################################################")
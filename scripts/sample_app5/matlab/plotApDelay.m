@@ -9,6 +9,7 @@ function [] = plotApDelay()
     placeTypes = {'AP 1 (60 km/h)','Ap 4 (40 km/h)','AP 11 (20 km/h)'};
 
     results = zeros(size(placeTypes,2),numOfMobileDevices);
+    placeColumns = 2:size(placeTypes,2)+1;
 
     for s=1:numOfSimulations
         indexCounter = 1;
@@ -19,9 +20,8 @@ function [] = plotApDelay()
                 readData1 = dlmread(filePath1,';',60,0);
                 readData2 = dlmread(filePath2,';',60,0);
                 
-                for j=1:size(placeTypes,2)
-                    results(j,indexCounter) = results(j,indexCounter) + mean(readData1(:,j+1)) + mean(readData2(:,j+1));
-                end
+                %column means of all places at once, first column is the time stamp
+                results(:,indexCounter) = results(:,indexCounter) + (mean(readData1(:,placeColumns),1) + mean(readData2(:,placeColumns),1))';
             catch err
                 error(err)
             end
@@ -12,6 +12,13 @@ function [] = plotDelayReasonAsBar(isEdge)
     if ~exist('isEdge','var')
         isEdge = 1;
     end
+    
+    %row of the edge or cloud results in GENERIC log files
+    if(isEdge == 1)
+        rowIndex = 2;
+    else
+        rowIndex = 3;
+    end
 
     for s=1:numOfSimulations
         for j=1:numOfMobileDevices
@@ -19,19 +26,10 @@ function [] = plotDelayReasonAsBar(isEdge)
                 mobileDeviceNumber = startOfMobileDeviceLoop + stepOfMobileDeviceLoop * (j-1);
                 filePath = strcat(folderPath,'\ite',int2str(s),'\SIMRESULT_ITS_SCENARIO_AI_BASED_',int2str(mobileDeviceNumber),'DEVICES_ALL_APPS_GENERIC.log');
 
-                readData = dlmread(filePath,';',1,0);
-                value1 = 0;
-                value2 = 0;
-                if(isEdge == 1)
-                    value1 = readData(2,5);
-                    value2 = readData(2,6);
-                else
-                    value1 = readData(3,5);
-                    value2 = readData(3,6);
-                end
+                %only read service and processing times of the related row
+                readData = dlmread(filePath,';',[rowIndex 4 rowIndex 5]);
                 
-                all_results(s,j,1) = value2;
-                all_results(s,j,2) = value1 - value2;
+                all_results(s,j,:) = [readData(2) readData(1)-readData(2)];
             catch err
                 error(err)
             end
@@ -9,6 +9,7 @@ function [] = plotGenericLine(rowOfset, columnOfset, yLabel, appType, legendPos,
     numOfMobileDevices = (endOfMobileDeviceLoop - startOfMobileDeviceLoop)/stepOfMobileDeviceLoop + 1;
 
     all_results = zeros(numOfSimulations, size(scenarioType,2), numOfMobileDevices);
+    all_totals = zeros(numOfSimulations, size(scenarioType,2), numOfMobileDevices);
     min_results = zeros(size(scenarioType,2), numOfMobileDevices);
     max_results = zeros(size(scenarioType,2), numOfMobileDevices);
     
@@ -34,27 +35,27 @@ function [] = plotGenericLine(rowOfset, columnOfset, yLabel, appType, legendPos,
     end
 
     for s=1:numOfSimulations
+        iteFolderPath = strcat(folderPath,'\ite',int2str(s));
         for i=1:size(scenarioType,2)
             for j=1:numOfMobileDevices
                 try
                     mobileDeviceNumber = startOfMobileDeviceLoop + stepOfMobileDeviceLoop * (j-1);
-                    filePath = strcat(folderPath,'\ite',int2str(s),'\SIMRESULT_ITS_SCENARIO_',char(scenarioType(i)),'_',int2str(mobileDeviceNumber),'DEVICES_',appType,'_GENERIC.log');
+                    filePath = strcat(iteFolderPath,'\SIMRESULT_ITS_SCENARIO_',char(scenarioType(i)),'_',int2str(mobileDeviceNumber),'DEVICES_',appType,'_GENERIC.log');
 
-                    readData = dlmread(filePath,';',rowOfset,0);
-                    value = readData(1,columnOfset);
-                    if(calculatePercentage==1)
-                        readData = dlmread(filePath,';',1,0);
-                		totalTask = readData(1,1)+readData(1,2);
-                        value = (100 * value) / totalTask;
-                    end
-
-                    all_results(s,i,j) = value;
+                    %read the file once, first row holds the total number of tasks
+                    readData = dlmread(filePath,';',1,0);
+                    all_results(s,i,j) = readData(rowOfset,columnOfset);
+                    all_totals(s,i,j) = readData(1,1)+readData(1,2);
                 catch err
                     error(err)
                 end
             end
         end
     end
+    
+    if(calculatePercentage==1)
+        all_results = (100 * all_results) ./ all_totals;
+    end
         
     if(numOfSimulations == 1)
         results = all_results;
@@ -121,22 +122,31 @@ function [] = plotGenericLine(rowOfset, columnOfset, yLabel, appType, legendPos,
     set(0,'DefaultTextFontName','Times New Roman');
     set(0,'DefaultAxesFontSize',fontSizeArray(3));
 
-    if(getConfiguration(20) == 1)
+    %read configuration values used in the plot loops only once
+    isColorful = getConfiguration(20);
+    plotErrors = getConfiguration(19);
+
+    if(isColorful == 1)
+        markers = getConfiguration(50);
+        lineColors = cell(1,size(scenarioType,2));
+        for j=1:size(scenarioType,2)
+            lineColors{j} = getConfiguration(20+j);
+        end
+        
         for i=1:1:numOfMobileDevices
             xIndex=startOfMobileDeviceLoop+((i-1)*stepOfMobileDeviceLoop);
             
-            markers = getConfiguration(50);
             for j=1:size(scenarioType,2)
-                plot(xIndex, results(j,i),char(markers(j)),'MarkerFaceColor',getConfiguration(20+j),'color',getConfiguration(20+j));
+                plot(xIndex, results(j,i),char(markers(j)),'MarkerFaceColor',lineColors{j},'color',lineColors{j});
                 hold on;
             end
         end
         
         for j=1:size(scenarioType,2)
-            if(getConfiguration(19) == 1)
-                errorbar(types, results(j,:), min_results(j,:),max_results(j,:),'-k','color',getConfiguration(20+j),'LineWidth',1);
+            if(plotErrors == 1)
+                errorbar(types, results(j,:), min_results(j,:),max_results(j,:),'-k','color',lineColors{j},'LineWidth',1);
             else
-                plot(types, results(j,:),'-k','color',getConfiguration(20+j),'LineWidth',1);
+                plot(types, results(j,:),'-k','color',lineColors{j},'LineWidth',1);
             end
             hold on;
         end
@@ -145,7 +155,7 @@ function [] = plotGenericLine(rowOfset, columnOfset, yLabel, appType, legendPos,
     else
         markers = getConfiguration(40);
         for j=1:size(scenarioType,2)
-            if(getConfiguration(19) == 1)
+            if(plotErrors == 1)
                 errorbar(types, results(j,:),min_results(j,:),max_results(j,:),char(markers(j)),'MarkerFaceColor','w','LineWidth',1);
             else
                plot(types, results(j,:),char(markers(j)),'MarkerFaceColor','w');
@@ -158,7 +168,7 @@ function [] = plotGenericLine(rowOfset, columnOfset, yLabel, appType, legendPos,
     legends = getConfiguration(6);
     lgnd = legend(legends,'Location',legendPos);
     %lgnd.Position=[0.21,0.8,0.2,0.01];
-    if(getConfiguration(20) == 1)
+    if(isColorful == 1)
         set(lgnd,'color','none');
     end
     
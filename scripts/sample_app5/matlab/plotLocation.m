@@ -17,9 +17,8 @@ function [] = plotLocation()
                 filePath = strcat(folderPath,'\ite',int2str(s),'\SIMRESULT_ITS_SCENARIO_AI_BASED_',int2str(i),'DEVICES_LOCATION.log');
                 readData = dlmread(filePath,';',1,0);
 
-                for j=1:PlaceCount
-                    results(indexCounter,j) = results(indexCounter,j) + mean(readData(:,j+1));
-                end
+                %column means of all places at once, first column is the time stamp
+                results(indexCounter,:) = results(indexCounter,:) + mean(readData(:,2:PlaceCount+1),1);
             catch err
                 error(err)
             end